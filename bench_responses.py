@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import subprocess
+import importlib
+
+from mcp import types
+
+# Mesure, outil par outil, la taille des réponses envoyées sur stdio et le
+# temps d'appel + encodage dans chaque mode de réponse.
+#
+# Usage: uv run bench_responses.py
+
+RUNS = 2000
+
+# (module, outil, arguments) — uniquement des outils sans appel réseau
+CASES = [
+    ("calculator", "add", {"a": 2, "b": 3}),
+    ("calculator", "divide", {"a": 10, "b": 4}),
+    ("calculator", "average", {"numbers": [1.5, 2.5, 3.5, 4.5]}),
+    ("calculator", "max_min", {"numbers": [3, 1, 4, 1, 5, 9, 2, 6]}),
+    ("flights_server", "search_by_flight_number", {"flight_number": "AF123"}),
+    ("flights_server", "filter_by_destination", {"destination": "Paris"}),
+    ("flights_server", "filter_by_status", {"status": "on time"}),
+    ("flights_server", "get_flights_by_time_range", {"start_time": "00:00", "end_time": "23:59"}),
+    ("flights_server", "get_flight_statistics", {}),
+    ("flights_server", "search_by_flight_numbers", {"flight_numbers": ["AF123", "BA456", "LH789", "EK321", "AA654", "XX000"]}),
+    ("openlibrary_mcp", "get_popular_python_books", {}),
+    ("openlibrary_mcp", "get_book_recommendations", {"topic": "python"}),
+]
+
+
+async def call(server, tool_name: str, args: dict) -> bytes:
+    """
+    Appelle un outil et encode le résultat comme sur stdio
+
+    On passe par le gestionnaire tools/call du serveur bas niveau de mcp : le
+    CallToolResult mesuré est celui que le serveur enverrait, quelle que soit
+    la version de mcp.
+    """
+    handler = server._mcp_server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(
+        method="tools/call",
+        params=types.CallToolRequestParams(name=tool_name, arguments=args)
+    )
+    result = await handler(request)
+    return result.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8")
+
+
+async def measure() -> dict:
+    """Mesure chaque outil dans le mode courant (MCP_RESPONSE_MODE)"""
+    results = {}
+    for module_name, tool_name, args in CASES:
+        server = importlib.import_module(module_name).mcp
+
+        start = time.perf_counter()
+        for _ in range(RUNS):
+            size = len(await call(server, tool_name, args))
+        elapsed = time.perf_counter() - start
+
+        results[tool_name] = {"bytes": size, "us": elapsed / RUNS * 1e6}
+    return results
+
+
+def run_mode(mode: str) -> dict:
+    """Relance ce script dans un sous-processus avec le mode demandé"""
+    env = dict(os.environ, MCP_RESPONSE_MODE=mode)
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure"],
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    if "--measure" in sys.argv:
+        print(json.dumps(asyncio.run(measure())))
+        sys.exit(0)
+
+    verbose = run_mode("verbose")
+    compact = run_mode("compact")
+
+    print(f"{'Outil':<28}{'verbose (o)':>12}{'compact (o)':>12}{'gain':>8}{'verbose (µs)':>14}{'compact (µs)':>14}")
+    for tool_name, v in verbose.items():
+        c = compact[tool_name]
+        saving = 100 * (1 - c["bytes"] / v["bytes"]) if v["bytes"] else 0
+        print(f"{tool_name:<28}{v['bytes']:>12}{c['bytes']:>12}{saving:>7.1f}%{v['us']:>14.1f}{c['us']:>14.1f}")
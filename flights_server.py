@@ -1,6 +1,8 @@
 from mcp.server.fastmcp import FastMCP
 import os
 import json
+import sys
+from tool_responses import RESPONSE_MODE, TOOL_OPTIONS, encode, encode_rows
 
 # Chemin absolu vers le fichier flights.json
 FLIGHTS_PATH = os.path.join(os.path.dirname(__file__), "flights.json")
@@ -41,7 +43,7 @@ def flights_resource():
 #
 
 # a. Recherche par numéro de vol
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def search_by_flight_number(flight_number: str) -> dict:
     """
     Recherche un vol par son numéro de vol
@@ -59,20 +61,20 @@ def search_by_flight_number(flight_number: str) -> dict:
     
     for flight in flights:
         if flight.get("flight_number", "").upper() == flight_number:
-            return {
+            return encode({
                 "found": True,
                 "flight": flight,
                 "message": f"Vol {flight_number} trouvé"
-            }
+            })
     
-    return {
+    return encode({
         "found": False,
         "message": f"Vol {flight_number} non trouvé",
         "available_flights": [f["flight_number"] for f in flights]
-    }
+    })
 
 # b. Filtrage par destination
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def filter_by_destination(destination: str) -> dict:
     """
     Filtre les vols par destination
@@ -92,15 +94,15 @@ def filter_by_destination(destination: str) -> dict:
         if flight.get("destination", "").title() == destination:
             filtered_flights.append(flight)
     
-    return {
+    return encode_rows(filtered_flights, {
         "destination": destination,
         "count": len(filtered_flights),
         "flights": filtered_flights,
         "message": f"{len(filtered_flights)} vol(s) trouvé(s) pour {destination}"
-    }
+    })
 
 # c. Filtrage par statut (TRAVAIL À FAIRE - complété)
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def filter_by_status(status: str) -> dict:
     """
     Filtre les vols par statut
@@ -117,10 +119,10 @@ def filter_by_status(status: str) -> dict:
     valid_statuses = ["on time", "delayed", "boarding", "scheduled", "cancelled"]
     
     if status not in valid_statuses:
-        return {
+        return encode({
             "error": f"Statut invalide. Statuts valides: {', '.join(valid_statuses)}",
             "valid_statuses": valid_statuses
-        }
+        })
     
     filtered_flights = []
     
@@ -128,15 +130,15 @@ def filter_by_status(status: str) -> dict:
         if flight.get("status", "").lower() == status:
             filtered_flights.append(flight)
     
-    return {
+    return encode_rows(filtered_flights, {
         "status": status,
         "count": len(filtered_flights),
         "flights": filtered_flights,
         "message": f"{len(filtered_flights)} vol(s) avec statut '{status}'"
-    }
+    })
 
 # d. Outil libre basé sur votre propre logique métier (TRAVAIL À FAIRE - complété)
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def get_flights_by_time_range(start_time: str, end_time: str) -> dict:
     """
     Recherche les vols dans une plage horaire
@@ -162,11 +164,11 @@ def get_flights_by_time_range(start_time: str, end_time: str) -> dict:
     end_minutes = time_to_minutes(end_time)
     
     if start_minutes > end_minutes:
-        return {
+        return encode({
             "error": "L'heure de début doit être avant l'heure de fin",
             "start_time": start_time,
             "end_time": end_time
-        }
+        })
     
     filtered_flights = []
     
@@ -180,15 +182,15 @@ def get_flights_by_time_range(start_time: str, end_time: str) -> dict:
     # Trier par heure de départ
     filtered_flights.sort(key=lambda x: time_to_minutes(x.get("departure", "00:00")))
     
-    return {
+    return encode_rows(filtered_flights, {
         "time_range": f"{start_time} - {end_time}",
         "count": len(filtered_flights),
         "flights": filtered_flights,
         "message": f"{len(filtered_flights)} vol(s) au départ entre {start_time} et {end_time}"
-    }
+    })
 
 # e. Outil supplémentaire : statistiques des vols
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def get_flight_statistics() -> dict:
     """
     Fournit des statistiques sur les vols
@@ -199,7 +201,7 @@ def get_flight_statistics() -> dict:
     flights = load_flights()
     
     if not flights:
-        return {"error": "Aucun vol disponible"}
+        return encode({"error": "Aucun vol disponible"})
     
     # Statistiques par statut
     status_stats = {}
@@ -219,13 +221,52 @@ def get_flight_statistics() -> dict:
         terminal = flight.get("terminal", "unknown")
         terminal_stats[terminal] = terminal_stats.get(terminal, 0) + 1
     
-    return {
+    return encode({
         "total_flights": len(flights),
         "status_distribution": status_stats,
         "destination_distribution": destination_stats,
         "terminal_distribution": terminal_stats,
         "message": f"Statistiques sur {len(flights)} vol(s)"
-    }
+    })
+
+# f. Recherche groupée par numéros de vol
+@mcp.tool(**TOOL_OPTIONS)
+def search_by_flight_numbers(flight_numbers: list[str]) -> dict:
+    """
+    Recherche plusieurs vols en un seul appel
+
+    Args:
+        flight_numbers: Liste de numéros de vol (ex: ["AF123", "BA456"])
+
+    Returns:
+        Vols trouvés dans l'ordre demandé et numéros introuvables (tels que fournis)
+    """
+    flights = load_flights()
+
+    # Index construit en un seul passage sur les vols (premier vol retenu en
+    # cas de doublon, comme search_by_flight_number)
+    index = {}
+    for flight in flights:
+        number = flight.get("flight_number", "").upper()
+        if number:
+            index.setdefault(number, flight)
+
+    found_flights = []
+    missing = []
+
+    for flight_number in flight_numbers:
+        flight = index.get(flight_number.upper().strip())
+        if flight is None:
+            missing.append(flight_number)
+        else:
+            found_flights.append(flight)
+
+    return encode_rows(found_flights, {
+        "count": len(found_flights),
+        "flights": found_flights,
+        "missing": missing,
+        "message": f"{len(found_flights)}/{len(flight_numbers)} vol(s) trouvé(s)"
+    }, missing=missing)
 
 # Lancement du serveur
 if __name__ == "__main__":
@@ -237,6 +278,8 @@ if __name__ == "__main__":
     print("   - filter_by_status: Filtre par statut")
     print("   - get_flights_by_time_range: Recherche par plage horaire")
     print("   - get_flight_statistics: Statistiques des vols")
+    print("   - search_by_flight_numbers: Recherche groupée par numéros de vol")
     print("🔗 Ressource disponible: flights://today")
+    print(f"⚙️  Mode de réponse: {RESPONSE_MODE}", file=sys.stderr)
     print("\n🚀 Serveur démarré...")
     mcp.run(transport="stdio")
\ No newline at end of file
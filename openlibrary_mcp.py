@@ -1,10 +1,23 @@
 from mcp.server.fastmcp import FastMCP
 import urllib.request
+import urllib.parse
+import urllib.error
 import json
 import ssl
+import sys
+import re
+from concurrent.futures import ThreadPoolExecutor
+from tool_responses import RESPONSE_MODE, TOOL_OPTIONS, encode, encode_rows
 
 BASE_URL = "https://openlibrary.org"
 
+# Recherche groupée : nombre de work IDs par requête search.json (limite la
+# longueur de l'URL) et nombre de requêtes parallèles pour le repli
+BATCH_SIZE = 50
+MAX_WORKERS = 8
+SEARCH_FIELDS = "key,title,author_name,first_publish_year,subject"
+WORK_ID_PATTERN = re.compile(r"^OL\d+W$")
+
 # Désactiver la vérification SSL pour éviter les problèmes de certificat (à éviter en production)
 ssl._create_default_https_context = ssl._create_unverified_context
 
@@ -18,10 +31,62 @@ def make_request(url):
         with urllib.request.urlopen(req, timeout=10) as response:
             data = response.read().decode('utf-8')
             return json.loads(data)
+    except urllib.error.HTTPError as e:
+        return {"error": f"Request failed: {str(e)}", "status": e.code}
     except Exception as e:
         return {"error": f"Request failed: {str(e)}"}
 
-@mcp.tool()
+def fetch_works_batch(work_ids):
+    """Résout un lot de work IDs en une seule requête search.json"""
+    keys = " OR ".join(f'"/works/{work_id}"' for work_id in work_ids)
+    query = urllib.parse.urlencode({
+        "q": f"key:({keys})",
+        "fields": SEARCH_FIELDS,
+        "limit": len(work_ids)
+    })
+    data = make_request(f"{BASE_URL}/search.json?{query}")
+
+    # En cas d'échec, les IDs du lot sont repris un par un par fetch_work
+    if "error" in data:
+        return {}
+
+    books = {}
+    for b in data.get("docs", []):
+        work_id = b.get("key", "").replace("/works/", "")
+        books[work_id] = {
+            "title": b.get("title", "Unknown"),
+            "author": b.get("author_name", ["Unknown"])[0] if b.get("author_name") else "Unknown",
+            "year": b.get("first_publish_year"),
+            "subjects": b.get("subject", [])[:5],
+            "work_id": work_id
+        }
+    return books
+
+def fetch_work(work_id):
+    """
+    Résout un work ID via /works/{id}.json (repli de la recherche groupée)
+
+    Renvoie (livre, erreur) : (None, None) si l'œuvre n'existe pas (404),
+    (None, message) si la requête a échoué pour une autre raison.
+    """
+    data = make_request(f"{BASE_URL}/works/{work_id}.json")
+
+    if "error" in data:
+        if data.get("status") == 404:
+            return None, None
+        return None, data["error"]
+
+    # L'auteur n'est qu'une référence (/authors/...) dans /works : inconnu ici
+    year = re.search(r"\d{4}", data.get("first_publish_date") or "")
+    return {
+        "title": data.get("title", "Unknown"),
+        "author": None,
+        "year": int(year.group()) if year else None,
+        "subjects": data.get("subjects", [])[:5],
+        "work_id": work_id
+    }, None
+
+@mcp.tool(**TOOL_OPTIONS)
 def search_books(query: str) -> list:
     """
     Search for books in OpenLibrary using a query string.
@@ -40,7 +105,7 @@ def search_books(query: str) -> list:
         data = make_request(url)
         
         if "error" in data:
-            return [data]
+            return encode_rows([data], compact_payload=data)
         
         books = data.get("docs", [])[:5]  # Limiter à 5 résultats
         
@@ -53,12 +118,17 @@ def search_books(query: str) -> list:
                 "work_id": b.get("key", "").replace("/works/", "")
             })
         
-        return result if result else [{"message": "No books found"}]
+        if not result:
+            message = {"message": "No books found"}
+            return encode_rows([message], compact_payload=message)
+        
+        return encode_rows(result)
         
     except Exception as e:
-        return [{"error": f"Search failed: {str(e)}"}]
+        error = {"error": f"Search failed: {str(e)}"}
+        return encode_rows([error], compact_payload=error)
 
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def get_book_details(work_id: str) -> dict:
     """
     Get basic book details
@@ -74,20 +144,81 @@ def get_book_details(work_id: str) -> dict:
         data = make_request(url)
         
         if "error" in data:
-            return data
+            return encode(data)
         
-        return {
+        return encode({
             "title": data.get("title", "Unknown"),
             "description": data.get("description", "No description available"),
             "subjects": data.get("subjects", [])[:5],
             "first_publish_date": data.get("first_publish_date"),
             "work_id": work_id
-        }
+        })
+        
+    except Exception as e:
+        return encode({"error": f"Failed to get book details: {str(e)}"})
+
+@mcp.tool(**TOOL_OPTIONS)
+def get_books_details(work_ids: list[str]) -> dict:
+    """
+    Get basic details for several books at once
+    
+    Work IDs are resolved in batched search requests; IDs missing from the
+    search index are then fetched individually, in parallel.
+    
+    Each book has title, author, year, subjects and work_id. Unlike
+    get_book_details there is no description or first_publish_date, and
+    author is None for books resolved by the individual fallback.
+    
+    Args:
+        work_ids: List of work IDs (e.g., ["OL2784125W", "OL19932156W"])
+    
+    Returns:
+        Books in the requested order, the work IDs that do not exist or are
+        invalid ("missing") and the lookups that failed ("errors"), both
+        reported as given in work_ids
+    """
+    try:
+        # ID normalisé pour chaque entrée ; les réponses reprennent l'entrée d'origine
+        normalized = [w.strip().replace("/works/", "") for w in work_ids]
+        # Les IDs invalides ne sont jamais envoyés : ils casseraient la requête groupée
+        unique_ids = [w for w in dict.fromkeys(normalized) if WORK_ID_PATTERN.match(w)]
+        batches = [unique_ids[i:i + BATCH_SIZE] for i in range(0, len(unique_ids), BATCH_SIZE)]
+        
+        books = {}
+        failed = {}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for batch_books in executor.map(fetch_works_batch, batches):
+                books.update(batch_books)
+            
+            # Repli : requêtes individuelles en parallèle pour les IDs restants
+            remaining = [w for w in unique_ids if w not in books]
+            for work_id, (book, error) in zip(remaining, executor.map(fetch_work, remaining)):
+                if book is not None:
+                    books[work_id] = book
+                elif error is not None:
+                    failed[work_id] = error
+        
+        found = [books[w] for w in normalized if w in books]
+        missing = [
+            original for original, w in zip(work_ids, normalized)
+            if w not in books and w not in failed
+        ]
+        errors = [
+            {"work_id": original, "error": failed[w]}
+            for original, w in zip(work_ids, normalized) if w in failed
+        ]
+        
+        return encode_rows(found, {
+            "count": len(found),
+            "books": found,
+            "missing": missing,
+            "errors": errors
+        }, missing=missing, errors=errors)
         
     except Exception as e:
-        return {"error": f"Failed to get book details: {str(e)}"}
+        return encode({"error": f"Failed to get books details: {str(e)}"})
 
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def get_popular_python_books() -> list:
     """
     Get a list of popular Python programming books
@@ -104,9 +235,9 @@ def get_popular_python_books() -> list:
         {"title": "Automate the Boring Stuff with Python", "author": "Al Sweigart", "work_id": "OL16876139W"}
     ]
     
-    return python_books
+    return encode_rows(python_books)
 
-@mcp.tool()
+@mcp.tool(**TOOL_OPTIONS)
 def get_book_recommendations(topic: str) -> list:
     """
     Get book recommendations by topic
@@ -135,16 +266,19 @@ def get_book_recommendations(topic: str) -> list:
     
     topic_lower = topic.lower()
     if topic_lower in topics:
-        return topics[topic_lower]
+        return encode_rows(topics[topic_lower])
     else:
-        return [{"error": f"Topic '{topic}' not found. Available topics: {', '.join(topics.keys())}"}]
+        error = {"error": f"Topic '{topic}' not found. Available topics: {', '.join(topics.keys())}"}
+        return encode_rows([error], compact_payload=error)
 
 if __name__ == "__main__":
     print("📚 Serveur OpenLibrary MCP (version simplifiée)")
     print("📋 Outils disponibles:")
     print("   - search_books: Rechercher des livres")
     print("   - get_book_details: Obtenir les détails d'un livre")
+    print("   - get_books_details: Détails de plusieurs livres en un appel")
     print("   - get_popular_python_books: Livres Python populaires")
     print("   - get_book_recommendations: Recommandations par sujet")
+    print(f"⚙️  Mode de réponse: {RESPONSE_MODE}", file=sys.stderr)
     print("\n🚀 Serveur démarré...")
     mcp.run(transport="stdio")
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os
+import json
+import math
+
+try:
+    import orjson
+except ImportError:  # orjson est optionnel, on retombe sur le module json standard
+    orjson = None
+
+# Forme des réponses des outils, partagée par tous les serveurs :
+#   - "verbose" : réponses complètes (comportement historique)
+#   - "compact" : résultat seul, listes empaquetées en colonnes
+RESPONSE_MODES = ("verbose", "compact")
+RESPONSE_MODE = os.environ.get("MCP_RESPONSE_MODE", "verbose").lower().strip()
+
+if RESPONSE_MODE not in RESPONSE_MODES:
+    raise ValueError(
+        f"MCP_RESPONSE_MODE invalide: '{RESPONSE_MODE}'. "
+        f"Modes valides: {', '.join(RESPONSE_MODES)}"
+    )
+
+COMPACT = RESPONSE_MODE == "compact"
+
+# Options passées à @mcp.tool() : en mode compact, les outils renvoient une
+# chaîne JSON déjà encodée, envoyée telle quelle (sans sortie structurée qui
+# dupliquerait la charge utile).
+TOOL_OPTIONS = {"structured_output": False} if COMPACT else {}
+
+# Champs purement descriptifs, retirés des réponses en mode compact
+VERBOSE_ONLY_KEYS = ("operation", "expression", "formatted", "count", "message")
+
+
+def _has_non_finite(value) -> bool:
+    """Indique si value contient un flottant infini ou NaN"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, list | tuple):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def dumps(payload) -> str:
+    """
+    Encode en JSON compact, avec orjson si disponible
+
+    On retombe sur json pour ce qu'orjson ne sait pas encoder à l'identique :
+    les entiers de plus de 64 bits (refusés) et les flottants infinis ou NaN
+    (écrits null par orjson, Infinity/NaN par json comme en mode verbose).
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(payload)
+        except orjson.JSONEncodeError:
+            encoded = None
+
+        # inf/nan deviennent null : on ne parcourt la réponse que dans ce cas
+        if encoded is not None and not (b"null" in encoded and _has_non_finite(payload)):
+            return encoded.decode("utf-8")
+
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def pack_rows(rows: list) -> dict:
+    """
+    Empaquette une liste de dictionnaires en colonnes
+
+    Les noms de champs ne sont envoyés qu'une seule fois :
+    [{"a": 1, "b": 2}, {"a": 3}] -> {"columns": ["a", "b"], "rows": [[1, 2], [3, None]]}
+    """
+    columns = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows]
+    }
+
+
+def encode(payload: dict, compact_payload: dict | None = None):
+    """
+    Réponse finale d'un outil déclaré avec TOOL_OPTIONS
+
+    En mode verbose la réponse est renvoyée telle quelle. En mode compact,
+    compact_payload (ou à défaut la réponse privée des VERBOSE_ONLY_KEYS)
+    est encodé ici en JSON compact et envoyé tel quel au client.
+
+    Les annotations de retour des outils (-> dict, -> list) ne décrivent donc
+    que le mode verbose : en mode compact, l'outil renvoie une chaîne. Elles
+    ne sont pas élargies en dict | str, car FastMCP en déduirait un autre
+    schéma de sortie structurée et changerait les réponses du mode verbose.
+    """
+    if not COMPACT:
+        return payload
+
+    if compact_payload is None:
+        compact_payload = {k: v for k, v in payload.items() if k not in VERBOSE_ONLY_KEYS}
+
+    return dumps(compact_payload)
+
+
+def encode_rows(rows: list, payload: dict | list | None = None,
+                compact_payload: dict | None = None, **extra):
+    """
+    Variante de encode() pour les outils qui renvoient une liste de lignes
+
+    En mode verbose, renvoie payload (ou à défaut les lignes elles-mêmes).
+    En mode compact, les lignes sont empaquetées en colonnes et complétées
+    par les champs de extra (ex: missing). compact_payload remplace le
+    tableau pour les erreurs et messages, envoyés comme avec encode().
+    """
+    if not COMPACT:
+        return rows if payload is None else payload
+
+    if compact_payload is not None:
+        return dumps(compact_payload)
+
+    return dumps({**pack_rows(rows), **extra})